@@ -47,4 +47,7 @@ setup(
         "tqdm",
         "portalocker",
     ],
+    extras_require={
+        "numba": ["numba"],
+    },
 )
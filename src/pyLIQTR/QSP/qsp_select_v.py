@@ -21,130 +21,223 @@ may violate any copyrights that exist in this work.
 import cirq
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional, without it the planners below run as plain python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
 #toffoli with appropriate basis change gates
 def toffoli(b0,b1,ctl0,ctl1,trgt):
         #3 qubits.
-        basis_change = []
-        if not b0:
-            basis_change.append(cirq.X.on(ctl0))
-        if not b1:
-            basis_change.append(cirq.X.on(ctl1))
-        
-        cnX = cirq.X(trgt).controlled_by(ctl0,ctl1)
+        return TOFFOLIS[(2 if b0 else 0) | (1 if b1 else 0)](ctl0,ctl1,trgt)
+
+#toffolis specialized for each control sense (F: controlled on 0, T: controlled on 1)
+def _toffoli_FF(ctl0,ctl1,trgt):
+    x0 = cirq.X.on(ctl0)
+    x1 = cirq.X.on(ctl1)
+    return [x0, x1, cirq.X(trgt).controlled_by(ctl0,ctl1), x1, x0]
+
+def _toffoli_FT(ctl0,ctl1,trgt):
+    x0 = cirq.X.on(ctl0)
+    return [x0, cirq.X(trgt).controlled_by(ctl0,ctl1), x0]
+
+def _toffoli_TF(ctl0,ctl1,trgt):
+    x1 = cirq.X.on(ctl1)
+    return [x1, cirq.X(trgt).controlled_by(ctl0,ctl1), x1]
 
-        return (basis_change+[cnX]+basis_change[::-1])
+def _toffoli_TT(ctl0,ctl1,trgt):
+    return [cirq.X(trgt).controlled_by(ctl0,ctl1)]
+
+# indexed by (b0 << 1) | b1
+TOFFOLIS = (_toffoli_FF, _toffoli_FT, _toffoli_TF, _toffoli_TT)
+# toffolis with the first control on 1, indexed by b1
+TOFFOLIS_B0T = (_toffoli_TF, _toffoli_TT)
 
 #implemented & checked
 def walkDown(bTree, qubits, ancilla):
-    def walkDown_helper(myc,bt,qbt,anc):
-        if len(bt)==0:
-            return myc
-        else:
-            myc.append(toffoli(bt[0],True, qbt[0], anc[0], anc[1]))
-            myc = walkDown_helper(myc, bt[1::], qbt[1::], anc[1::])
-            return myc
-        
-    circuit = cirq.Circuit()
-    circuit.append(toffoli(bTree[0],bTree[1], qubits[0], qubits[1], ancilla[0]))
-    circuit = walkDown_helper(circuit, bTree[2::], qubits[2::], ancilla)
-    
-    return circuit
+    return cirq.Circuit(walkDown_ops(bTree, qubits, ancilla))
+
+def walkDown_ops(bTree, qubits, ancilla):
+    value, width = bTree
+    ops = toffoli((value >> (width-1)) & 1, (value >> (width-2)) & 1, qubits[0], qubits[1], ancilla[0])
+    for i in range(2, width):
+        ops.extend(toffoli((value >> (width-1-i)) & 1, True, qubits[i], ancilla[i-2], ancilla[i-1]))
+
+    return ops
+
+#a step of distance 1 only flips the last of the first n_anc ancilla
+def _step_last_bit(ops, ancilla, n_anc):
+    if n_anc == 1:
+        ops.append(cirq.X.on(ancilla[0]))
+    else:
+        ops.append(cirq.CX.on(ancilla[n_anc-2],ancilla[n_anc-1]))
 
 #implemented
 #given a binary, insert the gates required to move from one node to a node on the right
-def stepRight(circuit, bTree, qubits, ancilla):
-    def myTof(c1,c2,trgt):
-        return toffoli(True,False,c1,c2,trgt)
-
-    def nth2last(n):
-        return -(n+1)
-    def h_distance(val1,val2):
-        return sum([0 if v1==v2 else 1 for v1,v2 in zip(val1,val2)])
-    #particular tree traversal rules
-    distance = h_distance(bTree,incrementBooleanTree(bTree))
+def stepRight(ops, bTree, qubits, ancilla):
+    bt_int, n_bt = bTree
     n_anc = len(ancilla)
+
+    # fast path for trees ending in 0 (every other step): incrementing only flips the last bit
+    if n_bt > 0 and not bt_int & 1:
+        _step_last_bit(ops, ancilla, n_anc)
+        return ops
+
+    myTof = _toffoli_TF
+
+    def h_distance(bt_int, n_bt):
+        # incrementing flips the trailing ones and the zero above them (or every bit on overflow)
+        return min((bt_int ^ (bt_int + 1)).bit_length(), n_bt)
+
+    # each level that needs more than two flips wraps the next level down (the tree with its
+    # last bit dropped) in a pair of toffolis. walk down the levels keeping the current
+    # lengths instead of slicing, and close the wrapping toffolis in reverse order afterwards
+    n_qbt = len(qubits)
+    unwind = []
+    #particular tree traversal rules
+    distance = h_distance(bt_int, n_bt)
+    while distance > 2:
+        x0 = qubits[n_qbt-1]
+        q0 = ancilla[n_anc-1]
+        q1 = ancilla[n_anc-2]
+        ops.extend(_toffoli_TT(q1, x0, q0))
+        unwind.append((q1, x0, q0))
+
+        bt_int >>= 1
+        n_bt -= 1
+        n_qbt -= 1
+        n_anc -= 1
+        distance = h_distance(bt_int, n_bt)
+
     if distance == 0:
         pass #no need to do anything.
     elif distance == 1:
-        if n_anc == 1:
-            q0 = ancilla[nth2last(0)]
-            circuit.append(cirq.X.on(q0))
-        else:
-            q0 = ancilla[nth2last(0)]
-            q1 = ancilla[nth2last(1)]
-            circuit.append(cirq.CX.on(q1,q0))
-    elif distance == 2:
+        _step_last_bit(ops, ancilla, n_anc)
+    else:
         if n_anc == 2:
-            q0 = ancilla[nth2last(0)]
-            q1 = ancilla[nth2last(1)]
-            x0 = qubits[nth2last(0)]
-            circuit.append(cirq.CX.on(q1,q0))
-            circuit.append(cirq.CX.on(x0,q0))
-            circuit.append(cirq.X.on(q1))
-            circuit.append(cirq.X.on(q0))
+            q0 = ancilla[n_anc-1]
+            q1 = ancilla[n_anc-2]
+            x0 = qubits[n_qbt-1]
+            ops.append(cirq.CX.on(q1,q0))
+            ops.append(cirq.CX.on(x0,q0))
+            ops.append(cirq.X.on(q1))
+            ops.append(cirq.X.on(q0))
         else:
-            q0 = ancilla[nth2last(0)]
-            q1 = ancilla[nth2last(1)]
-            q2 = ancilla[nth2last(2)]
-            x0 = qubits[nth2last(0)]
-            circuit.append(cirq.CX.on(q1,q0))
-            circuit.append(myTof(q2,x0,q0))
-            circuit.append(cirq.CX.on(q2,q1))
-    else:
-        #recurse
-        x0 = qubits[nth2last(0)]
-        q0 = ancilla[nth2last(0)]
-        q1 = ancilla[nth2last(1)]
-
-        qubits2 = qubits[0:-1]
-        ancilla2 = ancilla[0:-1]
-        m_bTree = bTree[0:-1]
-        circuit.append(toffoli(True, True, q1, x0, q0))
-        circuit = stepRight(circuit, m_bTree, qubits2, ancilla2)
-        circuit.append(toffoli(True, False, q1, x0, q0))
-    
-    return circuit
+            q0 = ancilla[n_anc-1]
+            q1 = ancilla[n_anc-2]
+            q2 = ancilla[n_anc-3]
+            x0 = qubits[n_qbt-1]
+            ops.append(cirq.CX.on(q1,q0))
+            ops.extend(myTof(q2,x0,q0))
+            ops.append(cirq.CX.on(q2,q1))
+
+    for q1, x0, q0 in reversed(unwind):
+        ops.extend(_toffoli_TF(q1, x0, q0))
+
+    return ops
 
 #implemented
 def applyAndStep(operators, start_bTree, end_bTree, controls, ancilla, target):
-    def applyAndStep_helper(myc, ops, sbT, ebT, qbs, anc, tgt):
-        if sbT == ebT:
-            myc.append(ops[0](anc[-1],tgt))
-            return myc
-        else:
-            myc.append(ops[0](anc[-1],tgt))
-            myc = stepRight(myc, sbT.copy(), qbs, anc)
-            return applyAndStep_helper(myc, ops[1::], incrementBooleanTree(sbT),\
-                            ebT, qbs, anc, tgt)
+    return cirq.Circuit(applyAndStep_ops(operators, start_bTree, end_bTree, controls, ancilla, target))
 
-    circuit = cirq.Circuit()
-    return applyAndStep_helper(circuit, operators, start_bTree, end_bTree,\
-                     controls, ancilla, target)
+def applyAndStep_ops(operators, start_bTree, end_bTree, controls, ancilla, target):
+    sbT = start_bTree
+    for op in operators:
+        yield from op(ancilla[-1],target)
+        if sbT[0] == end_bTree[0]:
+            break
+        yield from stepRight([], sbT, controls, ancilla)
+        sbT = incrementBooleanTree(sbT)
 
 
 
 #these two methods should just get wrapped into a class.
+#a boolean tree is held as (value, width), node i from the root is bit (width-1-i) of value
 def constructBooleanTree(n,m):
-    n = bin(n)[2:]
-    value = ''.join([''.join(['0' for __ in range(m-len(n))]),n])
-    value = [True if v=='1' else False for v in value ]
-    return value
-
-def incrementBooleanTree(n):
-    def incBT(m):
-        h = m[0]
-        m = m[1::]
-        if h == False:
-            return [True] + m
-        else:
-            return [False] + incBT(m)
-    n = n.copy()
-    n.reverse()
-    n = incBT(n)
-    n.reverse()
-    return n
+    return (n, max(m, n.bit_length(), 1))
+
+def incrementBooleanTree(bTree):
+    value, width = bTree
+    return ((value + 1) & ((1 << width) - 1), width)
+
+# gate codes produced by plan_qrom
+QROM_TOFFOLI = 0   # toffoli controlled on b_i+1 and a_i (with the given sense) targeting b_i
+QROM_CX = 1        # CX from b_i+1 to b_i, flipping the current address bit
+QROM_APPLY = 2     # apply the operator for the key at the given index
+
+# plan the gates of the QROM in applyAndWalk for the given (sorted) key values.
+# returns three arrays with an entry per gate: the gate code, the address bit (or key index
+# for QROM_APPLY) it acts on, and the control sense of the address bit
+@njit(cache=True)
+def plan_qrom(keys, width):
+    n_keys = len(keys)
+    max_ops = n_keys*(2*width + 2) + 2*width
+    kinds = np.empty(max_ops, dtype=np.int8)
+    bits = np.empty(max_ops, dtype=np.int32)
+    senses = np.empty(max_ops, dtype=np.int8)
+
+    if n_keys == 0:
+        return kinds[:0], bits[:0], senses[:0]
+
+    # bit values of the first and last keys, used to build up and clear the ancilla register
+    bit_pos = np.arange(width)
+    first_bits = (keys[0] >> bit_pos) & 1
+    last_bits = (keys[n_keys-1] >> bit_pos) & 1
+
+    # special case for the first value, build up the initial set of ancilla from the MSB
+    kinds[:width] = QROM_TOFFOLI
+    bits[:width] = bit_pos[::-1]
+    senses[:width] = first_bits[::-1]
+    n = width
+
+    for ki in range(n_keys):
+        key_val = keys[ki]
+        if ki > 0:
+            # move from previous key value to the new key value
+            prev_key_val = keys[ki-1]
+
+            # clear the current address until we get to a state where the bit values are equal
+            ci = 0
+            while not (prev_key_val >> (ci+1)) == (key_val >> (ci+1)):
+                kinds[n] = QROM_TOFFOLI
+                bits[n] = ci
+                senses[n] = (prev_key_val >> ci) & 1
+                n += 1
+                ci += 1
+
+            # flip the address of the least signfificant bit that is different
+            kinds[n] = QROM_CX
+            bits[n] = ci
+            senses[n] = 1
+            n += 1
+
+            # work our way down to the new value
+            while ci > 0:
+                kinds[n] = QROM_TOFFOLI
+                bits[n] = ci - 1
+                senses[n] = (key_val >> (ci-1)) & 1
+                n += 1
+                ci -= 1
+
+        kinds[n] = QROM_APPLY
+        bits[n] = ki
+        senses[n] = 1
+        n += 1
+
+    # clear the ancilla register
+    kinds[n:n+width] = QROM_TOFFOLI
+    bits[n:n+width] = bit_pos
+    senses[n:n+width] = last_bits
+    n += width
+
+    return kinds[:n], bits[:n], senses[:n]
 
 # apply operators from Hamiltonian controlled on address bits using a QROM
+# (returns a generator over the operations, so the circuit is never held in memory as a whole)
 #
 def applyAndWalk(operators, pos1, pos2, ctl_q, sel_q, anc_q, tgt_q):
 
@@ -180,67 +273,33 @@ def applyAndWalk(operators, pos1, pos2, ctl_q, sel_q, anc_q, tgt_q):
     #
     def qrom(qubit_dict, width, key_vals, operators):
 
-        circuit = cirq.Circuit()
-        circuit2 = cirq.Circuit()
-        
-        prev_key_val = -1
-        addrQubits = qubit_dict['a'][::-1]   # address bits
-        ancQubits = qubit_dict['b'][::-1]   # ancilla that holds current address
+        addrQubits = tuple(qubit_dict['a'][::-1])   # address bits
+        ancQubits = tuple(qubit_dict['b'][::-1])   # ancilla that holds current address
         selQubit = qubit_dict['s']   # global select
         trgtQubits = qubit_dict['t']   # target for memory
 
-        for key_val in key_vals:
-            if prev_key_val == -1:
-                # special case for the first value, build up the initial set of ancilla
-                for bi in range(width)[::-1]:
-                    ctlSense = (key_val >> bi) % 2 == 1
-
-                    # Extend the address starting from the MSB, the first gate is controlled on the global select
-                    if bi+1 == width:
-                        circuit.append(toffoli(True, ctlSense, selQubit , addrQubits[bi], ancQubits[bi]))
-                    else:
-                        circuit.append(toffoli(True, ctlSense, ancQubits[bi + 1] , addrQubits[bi], ancQubits[bi]))
-                    
+        # control of each address bit, the most significant bit is controlled on the global select
+        ctlQubits = ancQubits[1:width] + (selQubit,)
+        applyQubit = ancQubits[0]
+
+        # the gate sequence only depends on the key values, so plan it up front and
+        # map each planned gate onto the qubits here
+        kinds, bits, senses = plan_qrom(np.asarray(key_vals, dtype=np.int64), width)
+
+        # local names for the loop below
+        _tof = TOFFOLIS_B0T
+        _cx = cirq.CX.on
+        _apply = QROM_APPLY
+        _toffoli = QROM_TOFFOLI
+
+        for kind, bi, ctlSense in zip(kinds.tolist(), bits.tolist(), senses.tolist()):
+            if kind == _toffoli:
+                yield from _tof[ctlSense](ctlQubits[bi], addrQubits[bi], ancQubits[bi])
+            elif kind == _apply:
+                # apply the operator
+                yield from operators[key_vals[bi]](applyQubit, trgtQubits)
             else:
-                # move from previous key value to the new key value
-                ci = 0
-
-                # clear the current address until we get to a state where the bit values are equal
-                while not (prev_key_val >> (ci+1)) == (key_val >> (ci+1)):
-                    ctlSense = (prev_key_val >> ci) % 2 == 1
-                    circuit.append(toffoli(True, ctlSense, ancQubits[ci + 1], addrQubits[ci], ancQubits[ci]))
-
-                    ci += 1
-
-                # flip the address of the least signfificant bit that is different
-                if (ci + 1) == width:
-                    circuit.append(cirq.CX.on(selQubit, ancQubits[ci]))
-                else:
-                    circuit.append(cirq.CX.on(ancQubits[ci + 1], ancQubits[ci]))
-
-                # work our way down to the new value
-                while ci > 0:
-                    ctlSense = (key_val >> (ci-1)) % 2 == 1
-                    circuit.append(toffoli(True, ctlSense, ancQubits[ci], addrQubits[ci - 1], ancQubits[ci - 1]))
-                    
-                    ci -= 1
-
-            # apply the operator
-            circuit.append(operators[key_val](ancQubits[0], trgtQubits))
-            
-            prev_key_val = key_val
-
-        # clear the ancilla register
-        if not prev_key_val == -1:
-            for ci in range(width):
-                ctlSense = (prev_key_val >> ci) % 2 == 1
-
-                if (ci + 1) == width:
-                    circuit.append(toffoli(True, ctlSense, selQubit, addrQubits[ci], ancQubits[ci]))
-                else:
-                    circuit.append(toffoli(True, ctlSense, ancQubits[ci + 1], addrQubits[ci], ancQubits[ci]))
-
-        return circuit
+                yield _cx(ctlQubits[bi], ancQubits[bi])
 
     qubit_dict = dict()
     qubit_dict['a'] = ctl_q
@@ -252,6 +311,32 @@ def applyAndWalk(operators, pos1, pos2, ctl_q, sel_q, anc_q, tgt_q):
     
     return qrom(qubit_dict, len(ctl_q), key_values, operators)
 
+# controlled pauli gates, indexed by the pauli codes used in the term recipes
+def _controlled_x(ctrl, tq):
+    return [cirq.CX.on(ctrl,tq)]
+
+def _controlled_y(ctrl, tq):
+    return [cirq.inverse(cirq.S.on(tq)), cirq.CX.on(ctrl,tq), cirq.S.on(tq)]
+
+def _controlled_z(ctrl, tq):
+    return [cirq.CZ.on(ctrl,tq)]
+
+PAULI_CODES = {'X': 0, 'Y': 1, 'Z': 2}
+CONTROLLED_PAULIS = (_controlled_x, _controlled_y, _controlled_z)
+
+# a recipe for a hamiltonian term is (negative coefficient flag, ((pauli code, target index), ...)),
+# with identities dropped
+def pauli_recipe(term, n_targets):
+    paulis = tuple((PAULI_CODES[p], ti) for ti, p in enumerate(term[0][:n_targets]) if p in PAULI_CODES)
+    return (term[1] < 0, paulis)
+
+def controlled_pauli_gate(recipe, ctrl, targets):
+    neg_z, paulis = recipe
+    gate_sequence = [cirq.Z.on(ctrl)] if neg_z else []
+    for code, ti in paulis:
+        gate_sequence.extend(CONTROLLED_PAULIS[code](ctrl, targets[ti]))
+    return gate_sequence
+
 class SelVBase(cirq.Gate):
     #do we need knowledge of the hamiltonian here?
     def __init__(self,invert, hamiltonian,phase_qubit, target_qubits, control_qubits, ancilla_qubits,\
@@ -262,74 +347,62 @@ class SelVBase(cirq.Gate):
         self.__anc_q = ancilla_qubits
         self.__hamiltonian = hamiltonian
 
+        # snapshot the terms, so the recipes and the identity bounds in _decompose_ stay
+        # consistent if the hamiltonian's term list is changed after construction
+        self.__terms = tuple(self.__hamiltonian.terms)
+
+        # precompute the controlled pauli recipe of each term, the operator generators
+        # are built from these on first use and reused between decompositions
+        self.__recipes = [pauli_recipe(term, len(self.__tgt_q)) for term in self.__terms]
+        self.__op_generators = None
+
         super(SelVBase, self)
         
     def _num_qubits_(self):
         return len(self.__tgt_q)+len(self.__ctl_q)+1+len(self.__anc_q)
 
     def convert_hamiltonian_terms_to_operators(self):
-        def controlled_pauli_gate(pauliString, ctrl, targets):
-            gate_sequence = []
-            for p,tq in zip(pauliString,targets):
-                if p == "I":
-                    continue
-                elif p == "X":
-                    gate_sequence.append(cirq.CX.on(ctrl,tq))
-                elif p == "Y":
-                    gate_sequence.append(cirq.inverse(cirq.S.on(tq)))
-                    gate_sequence.append(cirq.CX.on(ctrl,tq))
-                    gate_sequence.append(cirq.S.on(tq))
-                elif p == "Z":
-                    gate_sequence.append(cirq.CZ.on(ctrl,tq))
-
-            return gate_sequence
-
-        operator_generators = []
-        for term in self.__hamiltonian.terms:
-            if (term[1] < 0):
-                add_z = lambda ctrl, qubits : [cirq.Z.on(ctrl)]
-                gate_seq = lambda ctrl, qubits, pauli=term[0]: add_z(ctrl, qubits)+controlled_pauli_gate(pauli,ctrl,qubits)
-                operator_generators.append(gate_seq)
-            else:
-                gate_seq = lambda ctrl, qubits, pauli=term[0]: controlled_pauli_gate(pauli,ctrl,qubits)
-                operator_generators.append(gate_seq)
-        return operator_generators
+        if self.__op_generators is None:
+            self.__op_generators = [lambda ctrl, qubits, recipe=recipe: controlled_pauli_gate(recipe, ctrl, qubits) \
+                                        for recipe in self.__recipes]
+        return self.__op_generators
 
     def _decompose_(self, qubits):
         #this is selectV!
         #helper functions~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         #identify pos1 and pos2
         #need to map hamiltonian terms to operators
-        ham_ps_is_identity = [(np.all([p=="I" for p in term[0]]) or term[1]==0) for term in self.__hamiltonian.terms]
+        ham_ps_is_identity = np.asarray([(set(term[0]) <= {"I"} or term[1]==0) for term in self.__terms], dtype=bool)
+        # argmin gives the first False, but is 0 when there is none (and fails on an empty array)
+        if ham_ps_is_identity.all():
+            raise ValueError("Hamiltonian has no non-identity terms with a nonzero coefficient")
         def find_first_non_identity_term(check):
-            for idx,k in enumerate(check):
-                if not k:
-                    return idx    
+            return int(np.argmin(check))
         pos1 = find_first_non_identity_term(ham_ps_is_identity)
-        pos2 = len(self.__hamiltonian) - find_first_non_identity_term(ham_ps_is_identity[::-1])
+        pos2 = len(self.__terms) - find_first_non_identity_term(ham_ps_is_identity[::-1])
         #this travels a tree and implements the selectV as appropriate
         #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
         if True:
             # this is the new way to do SelectV
             ham_as_ops = self.convert_hamiltonian_terms_to_operators()
-            circuit = applyAndWalk(ham_as_ops, pos1, pos2, self.__ctl_q, self.__phs_q, self.__anc_q, self.__tgt_q)
-            yield circuit
+            yield from applyAndWalk(ham_as_ops, pos1, pos2, self.__ctl_q, self.__phs_q, self.__anc_q, self.__tgt_q)
         else:
             # this is the new way to do selectV
             ham_as_ops = self.convert_hamiltonian_terms_to_operators()[pos1::]
-            start_node = [True]+constructBooleanTree(pos1,len(self.__ctl_q))
-            end_node = [True]+constructBooleanTree(pos2-1,len(self.__ctl_q))
-
-            downCircuit = walkDown(start_node, [self.__phs_q]+self.__ctl_q, self.__anc_q)
-            applyCircuit = applyAndStep(ham_as_ops, start_node, end_node, \
+            # prepend a set root node to each tree
+            start_value, start_width = constructBooleanTree(pos1,len(self.__ctl_q))
+            end_value, end_width = constructBooleanTree(pos2-1,len(self.__ctl_q))
+            start_node = ((1 << start_width) | start_value, start_width+1)
+            end_node = ((1 << end_width) | end_value, end_width+1)
+
+            yield from walkDown_ops(start_node, [self.__phs_q]+self.__ctl_q, self.__anc_q)
+            yield from applyAndStep_ops(ham_as_ops, start_node, end_node, \
                                         self.__ctl_q, [self.__phs_q]+self.__anc_q, self.__tgt_q)
 
-            upCircuit =  cirq.inverse(walkDown(end_node, [self.__phs_q]+self.__ctl_q, self.__anc_q))
-
-            yield downCircuit
-            yield applyCircuit
-            yield upCircuit
+            # the walk down is only toffolis and X gates, which are self-inverse, so
+            # walking back up from the end node is its operations in reverse order
+            yield from walkDown_ops(end_node, [self.__phs_q]+self.__ctl_q, self.__anc_q)[::-1]
 
     def _circuit_diagram_info_(self, args):
         return ["SelVBase"] * self.num_qubits()
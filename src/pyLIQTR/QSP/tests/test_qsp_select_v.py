@@ -0,0 +1,296 @@
+"""
+DISTRIBUTION STATEMENT A. Approved for public release. Distribution is unlimited.
+
+This material is based upon work supported by the Under Secretary of Defense for
+Research and Engineering under Air Force Contract No. FA8702-15-D-0001. Any opinions,
+findings, conclusions or recommendations expressed in this material are those of the
+author(s) and do not necessarily reflect the views of the Under Secretary of Defense
+for Research and Engineering.
+
+© 2022 Massachusetts Institute of Technology.
+
+The software/firmware is provided to you on an As-Is basis
+
+Delivered to the U.S. Government with Unlimited Rights, as defined in DFARS Part
+252.227-7013 or 7014 (Feb 2014). Notwithstanding any copyright notice, U.S. Government
+rights in this work are defined by DFARS 252.227-7013 or DFARS 252.227-7014 as detailed
+above. Use of this work other than as specifically authorized by the U.S. Government
+may violate any copyrights that exist in this work.
+"""
+import cirq
+import numpy as np
+import pytest
+
+from pyLIQTR.QSP.Hamiltonian import Hamiltonian as pyH
+from pyLIQTR.QSP.qsp_select_v import plan_qrom, applyAndWalk, SelVBase, walkDown, stepRight, \
+                                     applyAndStep, constructBooleanTree, incrementBooleanTree
+
+# toffoli onto an address ancilla, controlled on 1 for ctl and on the given sense for addr
+def tof(ctl, addr, anc, sense):
+    ccx = [cirq.X(anc).controlled_by(ctl, addr)]
+    return ccx if sense else [cirq.X(addr)] + ccx + [cirq.X(addr)]
+
+# a distinct operator for each key, so the test can tell which key was applied where
+def key_op(k, ctrl, tgt):
+    return [cirq.ZPowGate(exponent=1/(k+2)).on(tgt[0]).controlled_by(ctrl)]
+
+OPERATORS = [lambda ctrl, tgt, k=k: key_op(k, ctrl, tgt) for k in range(32)]
+
+# the boolean tree walk as it was written for trees held as lists of bools, used as a
+# reference for the (value, width) implementation
+def ref_toffoli(b0, b1, ctl0, ctl1, trgt):
+    basis_change = []
+    if not b0:
+        basis_change.append(cirq.X.on(ctl0))
+    if not b1:
+        basis_change.append(cirq.X.on(ctl1))
+    return basis_change + [cirq.X(trgt).controlled_by(ctl0, ctl1)] + basis_change[::-1]
+
+def ref_walkDown(bTree, qubits, ancilla):
+    circuit = cirq.Circuit(ref_toffoli(bTree[0], bTree[1], qubits[0], qubits[1], ancilla[0]))
+    for i in range(2, len(bTree)):
+        circuit.append(ref_toffoli(bTree[i], True, qubits[i], ancilla[i-2], ancilla[i-1]))
+    return circuit
+
+def ref_increment(bTree):
+    bTree = bTree.copy()
+    for i in reversed(range(len(bTree))):
+        bTree[i] = not bTree[i]
+        if bTree[i]:
+            break
+    return bTree
+
+def ref_stepRight(circuit, bTree, qubits, ancilla):
+    distance = sum([v1 != v2 for v1, v2 in zip(bTree, ref_increment(bTree))])
+    if distance == 0:
+        pass
+    elif distance == 1:
+        if len(ancilla) == 1:
+            circuit.append(cirq.X.on(ancilla[-1]))
+        else:
+            circuit.append(cirq.CX.on(ancilla[-2], ancilla[-1]))
+    elif distance == 2:
+        if len(ancilla) == 2:
+            circuit.append([cirq.CX.on(ancilla[-2], ancilla[-1]), cirq.CX.on(qubits[-1], ancilla[-1]),
+                            cirq.X.on(ancilla[-2]), cirq.X.on(ancilla[-1])])
+        else:
+            circuit.append(cirq.CX.on(ancilla[-2], ancilla[-1]))
+            circuit.append(ref_toffoli(True, False, ancilla[-3], qubits[-1], ancilla[-1]))
+            circuit.append(cirq.CX.on(ancilla[-3], ancilla[-2]))
+    else:
+        circuit.append(ref_toffoli(True, True, ancilla[-2], qubits[-1], ancilla[-1]))
+        circuit = ref_stepRight(circuit, bTree[:-1], qubits[:-1], ancilla[:-1])
+        circuit.append(ref_toffoli(True, False, ancilla[-2], qubits[-1], ancilla[-1]))
+    return circuit
+
+def ref_applyAndStep(operators, start_bTree, end_bTree, controls, ancilla, target):
+    circuit = cirq.Circuit()
+    for op in operators:
+        circuit.append(op(ancilla[-1], target))
+        if start_bTree == end_bTree:
+            break
+        circuit = ref_stepRight(circuit, start_bTree, controls, ancilla)
+        start_bTree = ref_increment(start_bTree)
+    return circuit
+
+def ref_tree(n, m):
+    return [b == "1" for b in bin(n)[2:].zfill(m)]
+
+class TestBooleanTree:
+    def qubits(self, n):
+        return [cirq.NamedQubit(f"q{i}") for i in range(n)], [cirq.NamedQubit(f"anc{i}") for i in range(n)]
+
+    def test_construct_and_increment(self):
+        for m in range(1, 6):
+            for n in range(1 << m):
+                bTree = constructBooleanTree(n, m)
+                assert bTree == (n, m)
+                if n+1 < (1 << m):
+                    assert incrementBooleanTree(bTree) == constructBooleanTree(n+1, m)
+            # incrementing the last tree wraps around
+            assert incrementBooleanTree(((1 << m) - 1, m)) == (0, m)
+
+    def test_walkDown(self):
+        (q0, q1, q2), (a0, a1, a2) = self.qubits(3)
+        expected = cirq.Circuit(
+            cirq.X(q1), cirq.X(a0).controlled_by(q0, q1), cirq.X(q1),
+            cirq.X(a1).controlled_by(q2, a0),
+        )
+        assert walkDown((0b101, 3), [q0, q1, q2], [a0, a1]) == expected
+
+    def test_stepRight_distance_1(self):
+        (q0, q1, q2), (a0, a1, a2) = self.qubits(3)
+        assert stepRight([], (0b0, 1), [], [a0]) == [cirq.X(a0)]
+        assert stepRight([], (0b110, 3), [q0, q1], [a0, a1, a2]) == [cirq.CX(a1, a2)]
+
+    def test_stepRight_distance_2(self):
+        (q0, q1, q2), (a0, a1, a2) = self.qubits(3)
+        # two ancilla
+        assert stepRight([], (0b01, 2), [q0], [a0, a1]) == \
+            [cirq.CX(a0, a1), cirq.CX(q0, a1), cirq.X(a0), cirq.X(a1)]
+        # more than two ancilla
+        assert stepRight([], (0b101, 3), [q0, q1], [a0, a1, a2]) == \
+            [cirq.CX(a1, a2), cirq.X(q1), cirq.X(a2).controlled_by(a0, q1), cirq.X(q1), cirq.CX(a0, a1)]
+
+    def test_stepRight_wrapped(self):
+        (q0, q1, q2), (a0, a1, a2) = self.qubits(3)
+        # 011 -> 100, a distance 2 step on the first two levels wrapped in a pair of toffolis
+        assert stepRight([], (0b011, 3), [q0, q1], [a0, a1, a2]) == [
+            cirq.X(a2).controlled_by(a1, q1),
+            cirq.CX(a0, a1), cirq.CX(q0, a1), cirq.X(a0), cirq.X(a1),
+            cirq.X(q1), cirq.X(a2).controlled_by(a1, q1), cirq.X(q1),
+        ]
+
+    def test_stepRight_overflow(self):
+        (q0, q1, q2), (a0, a1, a2) = self.qubits(3)
+        # all ones wraps around to all zeros, flipping every level
+        assert stepRight([], (0b11, 2), [q0], [a0, a1]) == \
+            [cirq.CX(a0, a1), cirq.CX(q0, a1), cirq.X(a0), cirq.X(a1)]
+        assert stepRight([], (0b111, 3), [q0, q1], [a0, a1, a2]) == [
+            cirq.X(a2).controlled_by(a1, q1),
+            cirq.CX(a0, a1), cirq.CX(q0, a1), cirq.X(a0), cirq.X(a1),
+            cirq.X(q1), cirq.X(a2).controlled_by(a1, q1), cirq.X(q1),
+        ]
+
+    @pytest.mark.parametrize("m", range(1, 6))
+    def test_walk_matches_reference(self, m):
+        # every start and end node of the tree walk in SelVBase with m control qubits
+        ctl, anc = self.qubits(m)
+        phs, tgt = cirq.NamedQubit("phs"), [cirq.NamedQubit("t")]
+        for pos1 in range(1 << m):
+            for pos2 in range(pos1+1, (1 << m) + 1):
+                start_value, start_width = constructBooleanTree(pos1, m)
+                end_value, end_width = constructBooleanTree(pos2-1, m)
+                start_node = ((1 << start_width) | start_value, start_width+1)
+                end_node = ((1 << end_width) | end_value, end_width+1)
+                ref_start = [True] + ref_tree(pos1, m)
+                ref_end = [True] + ref_tree(pos2-1, m)
+
+                assert walkDown(start_node, [phs]+ctl, anc) == ref_walkDown(ref_start, [phs]+ctl, anc)
+                assert walkDown(end_node, [phs]+ctl, anc) == ref_walkDown(ref_end, [phs]+ctl, anc)
+                assert applyAndStep(OPERATORS[pos1:], start_node, end_node, ctl, [phs]+anc, tgt) == \
+                    ref_applyAndStep(OPERATORS[pos1:], ref_start, ref_end, ctl, [phs]+anc, tgt)
+
+class TestQROM:
+    def qubits(self, width):
+        # address and ancilla qubits indexed by bit, applyAndWalk takes them MSB first
+        addr = [cirq.NamedQubit(f"a{i}") for i in range(width)]
+        anc = [cirq.NamedQubit(f"b{i}") for i in range(width)]
+        return addr, anc, cirq.NamedQubit("s"), [cirq.NamedQubit("t")]
+
+    def walk(self, operators, pos1, pos2, width):
+        addr, anc, sel, tgt = self.qubits(width)
+        return cirq.Circuit(applyAndWalk(operators, pos1, pos2, addr[::-1], sel, anc[::-1], tgt))
+
+    @pytest.mark.parametrize("width", range(1, 9))
+    def test_plan_qrom_matches_python(self, width):
+        pytest.importorskip("numba")
+        rng = np.random.default_rng(width)
+        for n_keys in [0, 1, 2, 5, 50]:
+            # sorted with repeats, so equal consecutive keys are covered too
+            keys = np.sort(rng.integers(0, 1 << width, n_keys)).astype(np.int64)
+            for jit, py in zip(plan_qrom(keys, width), plan_qrom.py_func(keys, width)):
+                np.testing.assert_array_equal(jit, py)
+
+    def test_width_1(self):
+        addr, anc, sel, tgt = self.qubits(1)
+        a0, b0, t = addr[0], anc[0], tgt
+
+        expected = cirq.Circuit(
+            tof(sel, a0, b0, 0),
+            key_op(0, b0, t),
+            cirq.CX(sel, b0),
+            key_op(1, b0, t),
+            tof(sel, a0, b0, 1),
+        )
+        assert self.walk(OPERATORS, 0, 2, 1) == expected
+
+    def test_width_2(self):
+        addr, anc, sel, tgt = self.qubits(2)
+        (a0, a1), (b0, b1), t = addr, anc, tgt
+
+        expected = cirq.Circuit(
+            tof(sel, a1, b1, 0),
+            tof(b1, a0, b0, 1),
+            key_op(1, b0, t),
+            # 1 -> 2
+            tof(b1, a0, b0, 1),
+            cirq.CX(sel, b1),
+            tof(b1, a0, b0, 0),
+            key_op(2, b0, t),
+            # 2 -> 3
+            cirq.CX(b1, b0),
+            key_op(3, b0, t),
+            tof(b1, a0, b0, 1),
+            tof(sel, a1, b1, 1),
+        )
+        assert self.walk(OPERATORS, 1, 4, 2) == expected
+
+    def test_width_3(self):
+        addr, anc, sel, tgt = self.qubits(3)
+        (a0, a1, a2), (b0, b1, b2), t = addr, anc, tgt
+
+        expected = cirq.Circuit(
+            tof(sel, a2, b2, 0),
+            tof(b2, a1, b1, 0),
+            tof(b1, a0, b0, 1),
+            key_op(1, b0, t),
+            # 1 -> 2
+            tof(b1, a0, b0, 1),
+            cirq.CX(b2, b1),
+            tof(b1, a0, b0, 0),
+            key_op(2, b0, t),
+            # 2 -> 3
+            cirq.CX(b1, b0),
+            key_op(3, b0, t),
+            # 3 -> 4
+            tof(b1, a0, b0, 1),
+            tof(b2, a1, b1, 1),
+            cirq.CX(sel, b2),
+            tof(b2, a1, b1, 0),
+            tof(b1, a0, b0, 0),
+            key_op(4, b0, t),
+            # 4 -> 5
+            cirq.CX(b1, b0),
+            key_op(5, b0, t),
+            tof(b1, a0, b0, 1),
+            tof(b2, a1, b1, 0),
+            tof(sel, a2, b2, 1),
+        )
+        assert self.walk(OPERATORS, 1, 6, 3) == expected
+
+class TestSelVBase:
+    def select_v(self, ham):
+        n_ctl = max(ham.loglen, 1)
+        phs = cirq.NamedQubit("phs")
+        tgt = [cirq.NamedQubit(f"t{i}") for i in range(ham.problem_size)]
+        ctl = [cirq.NamedQubit(f"c{i}") for i in range(n_ctl)]
+        anc = [cirq.NamedQubit(f"anc{i}") for i in range(n_ctl)]
+        gate = SelVBase(False, ham, phs, tgt, ctl, anc)
+        return gate, [phs] + tgt + ctl + anc
+
+    def decompose(self, gate, qubits):
+        return cirq.Circuit(cirq.decompose_once_with_qubits(gate, qubits))
+
+    def test_terms_changed_after_construction(self):
+        ham = pyH([("XI", 1.0), ("ZZ", -0.5), ("YX", 0.25)])
+        gate, qubits = self.select_v(ham)
+        expected = self.decompose(gate, qubits)
+
+        # the gate decomposes the terms it was constructed with
+        ham.terms.insert(0, ("II", 1.0))
+        ham.terms.append(("II", 1.0))
+        assert self.decompose(gate, qubits) == expected
+
+    @pytest.mark.parametrize("terms", [[("XI", 0.0)], [("II", 1.0), ("II", 0.5)]])
+    def test_no_live_terms(self, terms):
+        gate, qubits = self.select_v(pyH(terms))
+        with pytest.raises(ValueError):
+            self.decompose(gate, qubits)
+
+    def test_identity_terms_skipped(self):
+        ham = pyH([("II", 1.0), ("XZ", 0.5), ("ZZ", 0.0), ("YI", -0.5), ("II", 2.0)])
+        gate, qubits = self.select_v(ham)
+        n_cz = sum(isinstance(op.gate, cirq.CZPowGate) for op in self.decompose(gate, qubits).all_operations())
+        # the zero coefficient ZZ term inside the bounds is still applied, the identities outside are not
+        assert n_cz == 3
@@ -32,7 +32,7 @@ import pyLIQTR.sim_methods.quantum_ops  as vs
 from pyLIQTR.QSP.Hamiltonian             import Hamiltonian as pyH
 from pyLIQTR.QSP.qsp_helpers             import qsp_decompose_once
 #utils
-from pyLIQTR.utils.utils import open_fermion_to_qasm
+from pyLIQTR.utils.utils import open_fermion_to_qasm, count_T_gates
 from pyLIQTR.utils.printing import to_openqasm
 from pyLIQTR.gate_decomp.cirq_transforms import clifford_plus_t_direct_transform
 
@@ -133,6 +133,13 @@ class TestUtils:
             test = f"l{idx}: {test}"
             assert(truth==test)
 
+    def test_count_T_gates(self):
+        q0, q1 = cirq.LineQubit.range(2)
+        circuit = cirq.Circuit([cirq.T(q0), cirq.H(q1), cirq.T(q1)**-1, cirq.S(q0),
+                                cirq.CNOT(q0, q1), cirq.T(q0), cirq.Z(q1)**0.25])
+        assert count_T_gates(circuit) == 4
+        assert count_T_gates(cirq.Circuit([cirq.H(q0), cirq.S(q1)])) == 0
+
     @pytest.mark.skip
     def test_invalid_trotterized_hamiltonian(self):
         """Generate an invalid hamiltonian for a system (H2 in this case),
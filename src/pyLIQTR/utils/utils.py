@@ -18,6 +18,7 @@ above. Use of this work other than as specifically authorized by the U.S. Govern
 may violate any copyrights that exist in this work.
 """
 from openfermion   import jordan_wigner
+import cirq
 import numpy       as np
 import openfermion as of
 
@@ -37,6 +38,33 @@ qasm_convert_two_qubit_gates = {
     'CNOT': 'cx'
 }
 
+def _one_qubit_gate_converter(qasm_gate):
+    def convert(args, reg_name):
+        qubit_id = int(args.rpartition(' ')[2])
+        return f'{qasm_gate} {reg_name}[{qubit_id}];\n'
+    return convert
+
+def _two_qubit_gate_converter(qasm_gate):
+    def convert(args, reg_name):
+        qubit_ids = [int(x) for x in args.split(' ')]
+        return f'{qasm_gate} {reg_name}[{qubit_ids[0]}],{reg_name}[{qubit_ids[1]}];\n'
+    return convert
+
+def _rotation_gate_converter(qasm_gate):
+    def convert(args, reg_name):
+        angle, _, qubit = args.partition(' ')
+        rotation = float(angle)/np.pi
+        qubit_id = int(qubit.rpartition(' ')[2])
+        return f'{qasm_gate}(pi*{rotation}) {reg_name}[{qubit_id}];\n'
+    return convert
+
+# openfermion gate name -> function formatting the gate arguments as an OpenQASM 2.0 line
+qasm_gate_converters = {
+    **{gate: _one_qubit_gate_converter(qasm_gate) for gate, qasm_gate in qasm_convert_one_qubit_gates.items()},
+    **{gate: _two_qubit_gate_converter(qasm_gate) for gate, qasm_gate in qasm_convert_two_qubit_gates.items()},
+    **{gate: _rotation_gate_converter(qasm_gate) for gate, qasm_gate in qasm_convert_rotation_gates.items()},
+}
+
 def open_fermion_to_qasm(n_qubits:int, ofq_str, reg_name:str='reg', include_heading:bool=True):
     """
     A function for converting the openfermion qasm to OpenQASM 2.0
@@ -53,39 +81,29 @@ def open_fermion_to_qasm(n_qubits:int, ofq_str, reg_name:str='reg', include_head
     Returns:
         str_out : a string containing the OpenQASM 2.0 circuit
     """
+    # collect the lines and join them once at the end, concatenating onto the output
+    # string copies it for every line
     if include_heading:
-        str_out =  '// Generated from Cirq, Openfermion, and MIT LL\n\n'
-        str_out += 'OPENQASM 2.0;\n'
-        str_out += 'include \"qelib1.inc\";\n\n'
-        str_out += f'qreg {reg_name}[{n_qubits}];\n\n'
+        buf = ['// Generated from Cirq, Openfermion, and MIT LL\n\n',
+               'OPENQASM 2.0;\n',
+               'include \"qelib1.inc\";\n\n',
+               f'qreg {reg_name}[{n_qubits}];\n\n']
     else:
-        str_out = ''
+        buf = []
         
     for moment_str in ofq_str:
         
-        # split the string and grab the gate:
-        gate = moment_str.split(' ')[0]
-       
-        if gate in qasm_convert_one_qubit_gates:
-            
-            qubit_id = int(moment_str.split(' ')[-1])
-            str_out += f'{qasm_convert_one_qubit_gates[gate]} {reg_name}[{qubit_id}];\n'
-
-        elif gate in qasm_convert_two_qubit_gates:
-            
-            qubit_ids = [int(x) for x in moment_str.split(' ')[1:]]
-            str_out += f'{qasm_convert_two_qubit_gates[gate]} {reg_name}[{qubit_ids[0]}],{reg_name}[{qubit_ids[1]}];\n'
-
-        elif gate in qasm_convert_rotation_gates:
-            
-            rotation = float(moment_str.split(' ')[1])/np.pi
-            qubit_id = int(moment_str.split(' ')[-1])
-            str_out += f'{qasm_convert_rotation_gates[gate]}(pi*{rotation}) {reg_name}[{qubit_id}];\n'
+        # split off the gate, the remaining arguments are parsed by its converter
+        gate, _, args = moment_str.partition(' ')
+        convert = qasm_gate_converters.get(gate)
+
+        if convert is not None:
+            buf.append(convert(args, reg_name))
         else:
             print(f'> Gate = {gate} not in gate tables')
         
     
-    return str_out
+    return ''.join(buf)
 
 def count_T_gates(circuit):
     '''
@@ -98,11 +116,8 @@ def count_T_gates(circuit):
      - T_gate_counter: the number of T-Gates in the circuit
 
     '''
-    T_gate_counter = 0
-        
-    for moment in circuit:
-        for op in moment:
-            if (str(op).startswith('T')):
-                T_gate_counter += 1
+    T_gates = frozenset({cirq.T, cirq.T**-1})
+
+    T_gate_counter = sum(1 for moment in circuit for op in moment if op.gate in T_gates)
 
     return (T_gate_counter)
\ No newline at end of file